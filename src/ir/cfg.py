@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from enum import IntEnum
 import re
 import textwrap
-from typing import Iterator, Optional, Sequence
+from collections.abc import Callable
+from typing import Any, Iterator, NamedTuple, Optional, Sequence
 from src.parsing.parser import (
     Program,
     Function,
@@ -32,11 +34,11 @@ from src.parsing.semantic import SymbolTable
 from src.ir.helpers import bb_colors, color_label, unwrap
 
 
-@dataclass
-class SSAValue(ABC): ...
+class SSAValue(ABC):
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class SSAVariable(SSAValue):
     name: str
     base_pointer: Optional[tuple[str, int]] = field(default=None, compare=False)
@@ -62,7 +64,7 @@ class SSAVariable(SSAValue):
         return (self.name, unwrap(self.version))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SSAConstant(SSAValue):
     value: int
 
@@ -70,30 +72,89 @@ class SSAConstant(SSAValue):
         return str(self.value)
 
 
-class Operation(ABC): ...
+# operations are immutable, but not hashable in general: SSAVariable
+# operands are rewritten in place by SSA renaming and compare by value
+class Operation(ABC):
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OpCall(Operation):
     name: str
-    args: Sequence["SSAValue"]
+    args: tuple["SSAValue", ...]
 
     def __str__(self):
-        args_str = ", ".join(str(arg) for arg in self.args)
+        args_str = ", ".join([str(arg) for arg in self.args])
         return f"{self.name}({args_str})"
 
 
-@dataclass
+class BinOp(IntEnum):
+    ADD = 0
+    SUB = 1
+    MUL = 2
+    DIV = 3
+    MOD = 4
+    EQ = 5
+    NE = 6
+    LT = 7
+    LE = 8
+    GT = 9
+    GE = 10
+    AND = 11
+    OR = 12
+
+    @property
+    def symbol(self) -> str:
+        return _BINOP_SYMBOLS[self]
+
+
+_BINOP_MAP: dict[str, BinOp] = {
+    "+": BinOp.ADD,
+    "-": BinOp.SUB,
+    "*": BinOp.MUL,
+    "/": BinOp.DIV,
+    "%": BinOp.MOD,
+    "==": BinOp.EQ,
+    "!=": BinOp.NE,
+    "<": BinOp.LT,
+    "<=": BinOp.LE,
+    ">": BinOp.GT,
+    ">=": BinOp.GE,
+    "&&": BinOp.AND,
+    "||": BinOp.OR,
+}
+_BINOP_SYMBOLS: dict[BinOp, str] = {op: sym for sym, op in _BINOP_MAP.items()}
+
+
+class UnOp(IntEnum):
+    POS = 0
+    NEG = 1
+    NOT = 2
+
+    @property
+    def symbol(self) -> str:
+        return _UNOP_SYMBOLS[self]
+
+
+_UNOP_MAP: dict[str, UnOp] = {
+    "+": UnOp.POS,
+    "-": UnOp.NEG,
+    "!": UnOp.NOT,
+}
+_UNOP_SYMBOLS: dict[UnOp, str] = {op: sym for sym, op in _UNOP_MAP.items()}
+
+
+@dataclass(frozen=True, slots=True)
 class OpBinary(Operation):
-    type: str
+    type: BinOp
     left: "SSAValue"
     right: "SSAValue"
 
     def __repr__(self):
-        return f"{self.left} {self.type} {self.right}"
+        return f"{self.left} {self.type.symbol} {self.right}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OpLoad(Operation):
     addr: "SSAVariable"
 
@@ -101,22 +162,66 @@ class OpLoad(Operation):
         return f"Load({self.addr})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OpUnary(Operation):
-    type: str
+    type: UnOp
     val: "SSAValue"
 
     def __repr__(self):
-        return f"{self.type}{self.val}"
+        return f"{self.type.symbol}{self.val}"
+
+
+def eval_binary_op(op: BinOp, x: int, y: int) -> int | None:
+    """Evaluates a binary operation on constants, None if it traps at runtime."""
+    match op:
+        case BinOp.ADD:
+            return x + y
+        case BinOp.SUB:
+            return x - y
+        case BinOp.MUL:
+            return x * y
+        case BinOp.DIV:
+            return None if y == 0 else x // y
+        case BinOp.MOD:
+            return None if y == 0 else x % y
+        case BinOp.EQ:
+            return 1 if x == y else 0
+        case BinOp.NE:
+            return 1 if x != y else 0
+        case BinOp.LT:
+            return 1 if x < y else 0
+        case BinOp.LE:
+            return 1 if x <= y else 0
+        case BinOp.GT:
+            return 1 if x > y else 0
+        case BinOp.GE:
+            return 1 if x >= y else 0
+        case BinOp.AND:
+            return 1 if x != 0 and y != 0 else 0
+        case BinOp.OR:
+            return 1 if x != 0 or y != 0 else 0
+    raise RuntimeError(f"Unknown operator: {op}")
+
+
+def eval_unary_op(op: UnOp, x: int) -> int | None:
+    match op:
+        case UnOp.POS:
+            return x
+        case UnOp.NEG:
+            return -x
+        case UnOp.NOT:
+            return 0 if x != 0 else 1
+    return None
 
 
-@dataclass(eq=False)
 class Instruction(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def to_IR(self) -> str: ...
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class InstAssign(Instruction):
     lhs: SSAVariable
     rhs: Operation | SSAValue
@@ -125,7 +230,7 @@ class InstAssign(Instruction):
         return f"{self.lhs} = {self.rhs}"
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class InstCmp(Instruction):
     left: SSAValue
     right: SSAValue
@@ -139,7 +244,7 @@ class InstCmp(Instruction):
         return ir
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, frozen=True, slots=True)
 class InstUncondJump(Instruction):
     target_block: "BasicBlock"
 
@@ -147,7 +252,7 @@ class InstUncondJump(Instruction):
         return f"jmp {self.target_block.label}"
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class InstReturn(Instruction):
     value: Optional[SSAValue]
 
@@ -157,27 +262,27 @@ class InstReturn(Instruction):
         return f"return({self.value})"
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class InstPhi(Instruction):
     lhs: "SSAVariable"
     rhs: dict[str, "SSAValue"]  # Basic Block name -> corresponding SSAValue
 
     def to_IR(self):
-        rhs_str = ", ".join(f"{bb}: {val}" for bb, val in self.rhs.items())
+        rhs_str = ", ".join([f"{bb}: {val}" for bb, val in self.rhs.items()])
         return f"{self.lhs} = ϕ({rhs_str})"
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class InstArrayInit(Instruction):
     lhs: SSAVariable
     dimensions: list[int]
 
     def to_IR(self):
-        dims_str = "".join(f"[{d}]" for d in self.dimensions)
+        dims_str = "".join([f"[{d}]" for d in self.dimensions])
         return f"{self.lhs} = array_init({dims_str})"
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class InstStore(Instruction):
     dst_address: SSAVariable
     value: SSAValue
@@ -186,7 +291,7 @@ class InstStore(Instruction):
         return f"Store({self.dst_address}, {self.value})"
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class InstGetArgument(Instruction):
     lhs: SSAVariable
     index: int
@@ -206,27 +311,48 @@ class BasicBlock:
 
         self.instructions: list[Instruction] = []
         self.phi_nodes: dict[str, InstPhi] = {}
-        self.preds: list["BasicBlock"] = []
-        self.succ: list["BasicBlock"] = []
+        self.preds: dict[str, "BasicBlock"] = {}
+        self.succ: dict[str, "BasicBlock"] = {}
+
+        self._jump_inst: InstUncondJump | None = None
 
     def insert_phi(self, name: str):
-        if self.phi_nodes.get(name) is None:
+        if name not in self.phi_nodes:
             self.phi_nodes[name] = InstPhi(SSAVariable(name), {})
 
     def append(self, inst: Instruction):
         self.instructions.append(inst)
 
     def add_child(self, bb: "BasicBlock"):
-        if bb not in self.succ:
-            self.succ.append(bb)
-        if self not in bb.preds:
-            bb.preds.append(self)
+        self.succ.setdefault(bb.label, bb)
+        bb.preds.setdefault(self.label, self)
+
+    def is_terminated(self) -> bool:
+        return len(self.instructions) > 0 and isinstance(
+            self.instructions[-1], (InstUncondJump, InstCmp, InstReturn)
+        )
+
+    def jump_inst(self) -> InstUncondJump:
+        # jumps are immutable, so every jump to this block shares one instruction
+        if self._jump_inst is None:
+            self._jump_inst = InstUncondJump(self)
+        return self._jump_inst
 
-    def add_pred(self, bb: "BasicBlock"):
-        if bb not in self.preds:
-            self.preds.append(bb)
-        if self not in bb.succ:
-            bb.succ.append(self)
+    def emit_jump(self, target: "BasicBlock"):
+        self.instructions.append(target.jump_inst())
+        self.add_child(target)
+
+    def emit_cmp(
+        self,
+        left: SSAValue,
+        right: SSAValue,
+        then_block: "BasicBlock",
+        else_block: "BasicBlock",
+    ):
+        self.instructions.append(InstCmp(left, right, then_block, else_block))
+        # the fallthrough (non-equal) edge is always wired first
+        self.add_child(else_block)
+        self.add_child(then_block)
 
     def __hash__(self):
         return hash(self.label)
@@ -238,7 +364,7 @@ class BasicBlock:
         self.symbol_table
 
         res = ""
-        res += f"; pred: {self.preds}\n"
+        res += f"; pred: {list(self.preds.values())}\n"
         res += self.label + ":"
         if self.meta is not None:
             res += f" ; [{self.meta}]"
@@ -252,12 +378,12 @@ class BasicBlock:
         for inst in self.instructions:
             res += "    " + inst.to_IR().replace("\n", "\n    ") + "\n"
 
-        res += f"; succ: {self.succ}"
+        res += f"; succ: {list(self.succ.values())}"
         return res
 
     def to_html(self):
         res = ""
-        res += f'<font color="grey">; pred: {[color_label(bb.label) for bb in self.preds]}</font><br ALIGN="LEFT"/>'
+        res += f'<font color="grey">; pred: {[color_label(bb.label) for bb in self.preds.values()]}</font><br ALIGN="LEFT"/>'
         res += color_label(self.label) + ":"
         if self.meta is not None:
             res += f' <font color="grey">; [{self.meta}]</font>'
@@ -288,7 +414,7 @@ class BasicBlock:
                 )
             )
 
-        res += f'<font color="grey">; succ: {[color_label(bb.label) for bb in self.succ]}</font>'
+        res += f'<font color="grey">; succ: {[color_label(bb.label) for bb in self.succ.values()]}</font>'
         res += '<br ALIGN="left"/>'
         return res
 
@@ -302,12 +428,40 @@ class LoopInfo:
     blocks: set[BasicBlock] = field(init=False, default_factory=set)
 
 
+class LoopScope(NamedTuple):
+    brk: BasicBlock
+    cont: BasicBlock
+    parent: "LoopScope | None"
+
+
 @dataclass
 class CFG:
     name: str
     entry: BasicBlock
     exit: BasicBlock
     loops_info: list[LoopInfo] = field(init=False, default_factory=list)
+    blocks: dict[str, BasicBlock] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        self.add_block(self.entry)
+        self.add_block(self.exit)
+
+    def add_block(self, bb: BasicBlock):
+        self.blocks[bb.label] = bb
+
+    def remove_block(self, bb: BasicBlock):
+        """Unlinks the block from its neighbours and forgets it."""
+        for pred in bb.preds.values():
+            del pred.succ[bb.label]
+
+        for succ in bb.succ.values():
+            del succ.preds[bb.label]
+            for phi in succ.phi_nodes.values():
+                phi.rhs.pop(bb.label, None)
+
+        bb.succ = {}
+        bb.preds = {}
+        self.blocks.pop(bb.label, None)
 
     def __iter__(self) -> Iterator[BasicBlock]:
         visited_blocks = set()
@@ -318,7 +472,7 @@ class CFG:
                 continue
             visited_blocks.add(n)
             yield n
-            q.extend((s for s in n.succ if s not in visited_blocks))
+            q.extend((s for s in n.succ.values() if s not in visited_blocks))
 
     def to_graphviz(
         self,
@@ -355,7 +509,7 @@ class CFG:
             res += f'"{bb.label}" [label=<{bb_repr}>]\n'
 
         for bb in self:
-            for succ in bb.succ:
+            for succ in bb.succ.values():
                 res += (
                     f'"{bb.label}" -> "{succ.label}" '
                     + '[headport="n", tailport="s", penwidth=3, '
@@ -382,25 +536,105 @@ class CFG:
         return res
 
 
+_EXPRESSION_OPERANDS: dict[type[Expression], Callable[[Any], Sequence[Expression]]] = {
+    BinaryOp: lambda expr: (expr.left, expr.right),
+    UnaryOp: lambda expr: (expr.operand,),
+    CallExpression: lambda expr: expr.args,
+}
+
+
+def _expression_operands(expr: Expression) -> Sequence[Expression]:
+    operands_of = _EXPRESSION_OPERANDS.get(type(expr))
+    return operands_of(expr) if operands_of is not None else ()
+
+
+def _fold_constant_expression(expr: Expression) -> int | None:
+    match expr:
+        case IntegerLiteral():
+            return expr.value
+        case UnaryOp():
+            val = _fold_constant_expression(expr.operand)
+            if val is None:
+                return None
+            return eval_unary_op(_UNOP_MAP[expr.operator], val)
+        case BinaryOp():
+            left = _fold_constant_expression(expr.left)
+            if left is None:
+                return None
+            right = _fold_constant_expression(expr.right)
+            if right is None:
+                return None
+            return eval_binary_op(_BINOP_MAP[expr.operator], left, right)
+    return None
+
+
+# "%N" temporary names are formatted in batches and shared by all builders
+_TMP_VAR_NAMES: list[str] = []
+
+
+def _grow_tmp_var_names(n: int):
+    start = len(_TMP_VAR_NAMES)
+    _TMP_VAR_NAMES.extend(f"%{i}" for i in range(start, max(2 * n, 256)))
+
+
 class CFGBuilder:
     def __init__(self):
         self.block_counter = 0
         self.tmp_var_counter = 0
-        self.cur_block: Optional[BasicBlock] = None
-        self.break_targets: list[BasicBlock] = []  # Stack of break targets
-        self.continue_targets: list[BasicBlock] = []  # Stack of continue targets
+        self._loop: LoopScope | None = None  # innermost enclosing loop
+        self._const_pool: dict[int, SSAConstant] = {}
+        # (re)bound by _build_function for every function being built
+        self.cfg: CFG
+        self.cur_block: BasicBlock
+
+        self._stmt_dispatch: dict[type[Statement], Callable[[Any], None]] = {
+            Assignment: self._build_assignment,
+            Reassignment: self._build_reassignment,
+            Condition: self._build_condition,
+            ForLoop: self._build_for_loop,
+            UnconditionalLoop: self._build_unconditional_loop,
+            FunctionCall: self._build_function_call,
+            Return: self._build_return,
+            Break: self._build_break,
+            Continue: self._build_continue,
+        }
+        self._expr_dispatch: dict[
+            type[Expression], Callable[[Any, str, list[SSAValue]], SSAValue]
+        ] = {
+            BinaryOp: self._emit_binary_op,
+            UnaryOp: self._emit_unary_op,
+            Identifier: self._emit_identifier,
+            IntegerLiteral: self._emit_integer_literal,
+            CallExpression: self._emit_call,
+            ArrayAccess: self._emit_array_access,
+            ArrayInit: self._emit_array_init,
+        }
+
+    def _const(self, value: int) -> SSAConstant:
+        # constants are never mutated after construction, so a single
+        # instance per value is shared by all of the function's instructions
+        const = self._const_pool.get(value)
+        if const is None:
+            const = self._const_pool[value] = SSAConstant(value)
+        return const
 
     def _get_tmp_var(self) -> str:
-        name = f"%{self.tmp_var_counter}"
+        n = self.tmp_var_counter
         self.tmp_var_counter += 1
+        if n >= len(_TMP_VAR_NAMES):
+            _grow_tmp_var_names(n)
+        return _TMP_VAR_NAMES[n]
+
+    def _new_label(self) -> str:
+        name = f"BB{self.block_counter}"
+        self.block_counter += 1
         return name
 
     def _new_block(
         self, symbol_table: SymbolTable, meta: Optional[str] = None
     ) -> BasicBlock:
-        name = f"BB{self.block_counter}"
-        self.block_counter += 1
-        bb = BasicBlock(name, symbol_table, meta)
+        bb = BasicBlock(self._new_label(), symbol_table, meta)
+        self.cfg.add_block(bb)
         return bb
 
     def _switch_to_block(self, bb: BasicBlock):
@@ -414,12 +648,12 @@ class CFGBuilder:
         return cfgs
 
     def _build_function(self, func: Function) -> CFG:
-        self.break_targets = []
-        self.continue_targets = []
+        self._loop = None
+        self._const_pool = {}
 
         assert func.body.symbol_table is not None
-        entry = self._new_block(func.body.symbol_table, "entry")
-        exit_block = self._new_block(func.body.symbol_table, "exit")
+        entry = BasicBlock(self._new_label(), func.body.symbol_table, "entry")
+        exit_block = BasicBlock(self._new_label(), func.body.symbol_table, "exit")
 
         self.cfg = CFG(func.name, entry=entry, exit=exit_block)
         self.cur_block = entry
@@ -427,96 +661,134 @@ class CFGBuilder:
         for i, arg in enumerate(func.args):
             self.cur_block.append(InstGetArgument(SSAVariable(arg.name), i))
         self._build_block(func.body)
-
-        if not self.cur_block.succ:
-            self.cur_block.add_child(exit_block)
+        self._sweep_blocks()
 
         return self.cfg
 
-    def _build_block(self, syntax_block: Block):
-        assert self.cur_block is not None
+    def _sweep_blocks(self):
+        """Drops blocks left unreachable by returns and wires sinks to exit."""
+        order = list(self.cfg)
+        reachable = set(order)
+        for bb in list(self.cfg.blocks.values()):
+            if bb not in reachable and bb is not self.cfg.exit:
+                self.cfg.remove_block(bb)
+
+        for bb in order:
+            if not bb.succ and bb is not self.cfg.exit:
+                bb.add_child(self.cfg.exit)
 
+        self.cfg.loops_info = [
+            loop for loop in self.cfg.loops_info if loop.preheader in reachable
+        ]
+
+    def _build_block(self, syntax_block: Block):
         for stmt in syntax_block.statements:
             self._build_statement(stmt)
 
     def _build_statement(self, stmt: Statement):
-        match stmt:
-            case Assignment():
-                self._build_assignment(stmt)
-            case Reassignment():
-                self._build_reassignment(stmt)
-            case Condition():
-                self._build_condition(stmt)
-            case ForLoop():
-                self._build_for_loop(stmt)
-            case UnconditionalLoop():
-                self._build_unconditional_loop(stmt)
-            case FunctionCall():
-                self._build_function_call(stmt)
-            case Return():
-                self._build_return(stmt)
-            case Break():
-                self._build_break(stmt)
-            case Continue():
-                self._build_continue(stmt)
+        try:
+            build = self._stmt_dispatch[type(stmt)]
+        except KeyError:
+            raise ValueError(f"Unknown statement type: {type(stmt).__name__}") from None
+        build(stmt)
 
     def _build_assignment(self, stmt: Assignment):
-        assert self.cur_block is not None, "Current block must be set"
-
         type_info = unwrap(self.cur_block.symbol_table.lookup_variable(stmt.name))
         if isinstance(stmt.value, ArrayInit):
             lhs_var = SSAVariable(stmt.name)
             self.cur_block.append(InstArrayInit(lhs_var, type_info.dimensions))
             return
 
-        subexpr_ssa_val = self._build_subexpression(stmt.value, stmt.name)
-        if (
-            not isinstance(subexpr_ssa_val, SSAVariable)
-            or subexpr_ssa_val.name != stmt.name
-        ):
-            lhs = SSAVariable(stmt.name)
-            self.cur_block.append(InstAssign(lhs, subexpr_ssa_val))
+        self._build_named_expr(stmt.name, stmt.value)
+
+    def _build_named_expr(self, name: str, value: Expression):
+        """Evaluates `value` into the variable `name`."""
+        subexpr_ssa_val = self._build_subexpression(value, name)
+        if not isinstance(subexpr_ssa_val, SSAVariable) or subexpr_ssa_val.name != name:
+            self.cur_block.append(InstAssign(SSAVariable(name), subexpr_ssa_val))
 
     def _build_subexpression(self, expr: Expression, name: str) -> SSAValue:
-        assert self.cur_block is not None, "Current block must be set"
+        get_tmp_var = self._get_tmp_var
+        expr_dispatch = self._expr_dispatch
 
-        match expr:
-            case BinaryOp(_, _, op, left, right):
-                left_val = self._build_subexpression(left, self._get_tmp_var())
-                right_val = self._build_subexpression(right, self._get_tmp_var())
+        # post-order walk over (expression, result name, operands, operand values)
+        stack: list[tuple[Expression, str, Sequence[Expression], list[SSAValue]]] = [
+            (expr, name, _expression_operands(expr), [])
+        ]
+        while True:
+            expr, name, children, values = stack[-1]
+            if len(values) < len(children):
+                child = children[len(values)]
+                # leaves are used directly, but still consume a temporary
+                # slot so that temporaries keep their numbering
+                if isinstance(child, Identifier):
+                    self.tmp_var_counter += 1
+                    values.append(SSAVariable(child.name))
+                elif isinstance(child, IntegerLiteral):
+                    self.tmp_var_counter += 1
+                    values.append(self._const(child.value))
+                else:
+                    operands = _expression_operands(child)
+                    stack.append((child, get_tmp_var(), operands, []))
+                continue
 
-                lhs = SSAVariable(name)
-                self.cur_block.append(
-                    InstAssign(lhs, OpBinary(op, left_val, right_val))
-                )
-                return lhs
-            case UnaryOp(_, _, op, operand):
-                subexpr_val = self._build_subexpression(operand, self._get_tmp_var())
-                lhs = SSAVariable(name)
-                self.cur_block.append(InstAssign(lhs, OpUnary(op, subexpr_val)))
-                return lhs
-            case Identifier(_, _, ident_name):
-                return SSAVariable(ident_name)
-            case IntegerLiteral(_, _, value):
-                return SSAConstant(value)
-            case CallExpression(_, _, func_name, args):
-                args = [
-                    self._build_subexpression(arg, self._get_tmp_var()) for arg in args
-                ]
-                lhs = SSAVariable(name)
-                self.cur_block.append(InstAssign(lhs, OpCall(func_name, args)))
-                return lhs
-            case ArrayAccess():
-                return self._build_array_access(expr, name)
-            case ArrayInit():
-                return SSAVariable(name)
-            case _:
-                raise ValueError(f"Unknown expression type: {type(expr).__name__}")
+            stack.pop()
+            try:
+                emit = expr_dispatch[type(expr)]
+            except KeyError:
+                raise ValueError(
+                    f"Unknown expression type: {type(expr).__name__}"
+                ) from None
+            value = emit(expr, name, values)
+
+            if not stack:
+                return value
+            stack[-1][3].append(value)
+
+    def _emit_binary_op(
+        self, expr: BinaryOp, name: str, operands: list[SSAValue]
+    ) -> SSAValue:
+        lhs = SSAVariable(name)
+        op = OpBinary(_BINOP_MAP[expr.operator], operands[0], operands[1])
+        self.cur_block.append(InstAssign(lhs, op))
+        return lhs
+
+    def _emit_unary_op(
+        self, expr: UnaryOp, name: str, operands: list[SSAValue]
+    ) -> SSAValue:
+        lhs = SSAVariable(name)
+        self.cur_block.append(
+            InstAssign(lhs, OpUnary(_UNOP_MAP[expr.operator], operands[0]))
+        )
+        return lhs
+
+    def _emit_identifier(
+        self, expr: Identifier, _: str, __: list[SSAValue]
+    ) -> SSAValue:
+        return SSAVariable(expr.name)
+
+    def _emit_integer_literal(
+        self, expr: IntegerLiteral, _: str, __: list[SSAValue]
+    ) -> SSAValue:
+        return self._const(expr.value)
+
+    def _emit_call(
+        self, expr: CallExpression, name: str, operands: list[SSAValue]
+    ) -> SSAValue:
+        lhs = SSAVariable(name)
+        self.cur_block.append(InstAssign(lhs, OpCall(expr.name, tuple(operands))))
+        return lhs
+
+    def _emit_array_access(
+        self, expr: ArrayAccess, name: str, _: list[SSAValue]
+    ) -> SSAValue:
+        return self._build_array_access(expr, name)
+
+    def _emit_array_init(self, _: ArrayInit, name: str, __: list[SSAValue]) -> SSAValue:
+        return SSAVariable(name)
 
     def _build_array_access(self, expr: ArrayAccess, name: str) -> SSAValue:
         """Build array access with pointer arithmetic and dereference."""
-        assert self.cur_block is not None, "Current block must be set"
-
         base_val = self._build_subexpression(expr.base, self._get_tmp_var())
 
         assert isinstance(expr.base, Identifier)
@@ -537,16 +809,16 @@ class CFGBuilder:
         for i, index_expr in enumerate(expr.indices):
             index_val = self._build_subexpression(index_expr, self._get_tmp_var())
 
-            stride_const = SSAConstant(strides[i])
+            stride_const = self._const(strides[i])
             stride_tmp = SSAVariable(self._get_tmp_var())
-            stride_op = OpBinary("*", index_val, stride_const)
+            stride_op = OpBinary(BinOp.MUL, index_val, stride_const)
             self.cur_block.append(InstAssign(stride_tmp, stride_op))
 
             if current_addr is None:
                 current_addr = stride_tmp
             else:
                 addr_tmp = SSAVariable(self._get_tmp_var())
-                op = OpBinary("+", current_addr, stride_tmp)
+                op = OpBinary(BinOp.ADD, current_addr, stride_tmp)
                 self.cur_block.append(InstAssign(addr_tmp, op))
                 current_addr = addr_tmp
 
@@ -556,7 +828,7 @@ class CFGBuilder:
             current_addr = addr_tmp
         else:
             addr_tmp = SSAVariable(self._get_tmp_var())
-            op = OpBinary("+", base_val, current_addr)
+            op = OpBinary(BinOp.ADD, base_val, current_addr)
             self.cur_block.append(InstAssign(addr_tmp, op))
             current_addr = addr_tmp
 
@@ -566,8 +838,6 @@ class CFGBuilder:
         return lhs
 
     def _build_reassignment(self, stmt: Reassignment):
-        assert self.cur_block is not None, "Current block must be set"
-
         if isinstance(stmt.lvalue, LValueArrayAccess):
             self._build_array_element_assignment(stmt.lvalue, stmt.value)
             return
@@ -575,20 +845,12 @@ class CFGBuilder:
         assert isinstance(stmt.lvalue, LValueIdentifier), (
             "Expected LValueIdentifier for simple reassignment"
         )
-        subexpr_ssa_val = self._build_subexpression(stmt.value, stmt.lvalue.name)
-        if (
-            not isinstance(subexpr_ssa_val, SSAVariable)
-            or subexpr_ssa_val.name != stmt.lvalue.name
-        ):
-            lhs = SSAVariable(stmt.lvalue.name)
-            self.cur_block.append(InstAssign(lhs, subexpr_ssa_val))
+        self._build_named_expr(stmt.lvalue.name, stmt.value)
 
     def _build_array_element_assignment(
         self, lvalue: LValueArrayAccess, value: Expression
     ):
         """Build array element assignment: arr[i][j] = value."""
-        assert self.cur_block is not None, "Current block must be set"
-
         array_type = unwrap(self.cur_block.symbol_table.lookup_variable(lvalue.base))
         assert array_type.is_array()
 
@@ -607,16 +869,16 @@ class CFGBuilder:
         for i, index_expr in enumerate(lvalue.indices):
             index_val = self._build_subexpression(index_expr, self._get_tmp_var())
 
-            stride_const = SSAConstant(strides[i])
+            stride_const = self._const(strides[i])
             stride_tmp = SSAVariable(self._get_tmp_var())
-            stride_op = OpBinary("*", index_val, stride_const)
+            stride_op = OpBinary(BinOp.MUL, index_val, stride_const)
             self.cur_block.append(InstAssign(stride_tmp, stride_op))
 
             if current_addr is None:
                 current_addr = stride_tmp
             else:
                 addr_tmp = SSAVariable(self._get_tmp_var())
-                op = OpBinary("+", current_addr, stride_tmp)
+                op = OpBinary(BinOp.ADD, current_addr, stride_tmp)
                 self.cur_block.append(InstAssign(addr_tmp, op))
                 current_addr = addr_tmp
 
@@ -626,7 +888,7 @@ class CFGBuilder:
             current_addr = addr_tmp
         else:
             addr_tmp = SSAVariable(self._get_tmp_var())
-            op = OpBinary("+", base_val, current_addr)
+            op = OpBinary(BinOp.ADD, base_val, current_addr)
             self.cur_block.append(InstAssign(addr_tmp, op))
             current_addr = addr_tmp
 
@@ -635,63 +897,75 @@ class CFGBuilder:
         self.cur_block.append(InstStore(current_addr, value_val))
 
     def _build_function_call(self, stmt: FunctionCall):
-        assert self.cur_block is not None, "Current block must be set"
         tmp = SSAVariable(self._get_tmp_var())
-        args = [
+        args = tuple(
             self._build_subexpression(arg, self._get_tmp_var()) for arg in stmt.args
-        ]
+        )
         self.cur_block.append(InstAssign(tmp, OpCall(stmt.name, args)))
 
     def _build_condition(self, stmt: Condition):
-        assert self.cur_block is not None, "Current block must be set"
+        folded = _fold_constant_expression(stmt.condition)
+        if folded is not None:
+            self._build_folded_condition(stmt, folded != 0)
+            return
 
         then_block = self._new_block(unwrap(stmt.then_block.symbol_table), "then")
         merge_block = self._new_block(self.cur_block.symbol_table, "merge")
 
-        self.cur_block.add_child(then_block)
         cond_var = self._build_subexpression(stmt.condition, self._get_tmp_var())
         if stmt.else_block is None:
-            self.cur_block.append(
-                InstCmp(cond_var, SSAConstant(0), merge_block, then_block)
-            )
-            self.cur_block.add_child(merge_block)
+            self.cur_block.emit_cmp(cond_var, self._const(0), merge_block, then_block)
         else:
             else_block = self._new_block(unwrap(stmt.else_block.symbol_table), "else")
-            self.cur_block.append(
-                InstCmp(cond_var, SSAConstant(0), else_block, then_block)
-            )
-            self.cur_block.add_child(else_block)
+            self.cur_block.emit_cmp(cond_var, self._const(0), else_block, then_block)
 
-            old_block = self.cur_block
             self._switch_to_block(else_block)
             self._build_block(stmt.else_block)
-
-            if self.cur_block == else_block:
-                self.cur_block.add_child(merge_block)
-
-            if len(self.cur_block.instructions) == 0 or not isinstance(
-                self.cur_block.instructions[-1],
-                (InstUncondJump, InstCmp, InstReturn),
-            ):
-                self.cur_block.add_child(merge_block)
-                self.cur_block.append(InstUncondJump(merge_block))
-                self._switch_to_block(old_block)
+            if not self.cur_block.is_terminated():
+                self.cur_block.emit_jump(merge_block)
 
         self._switch_to_block(then_block)
         self._build_block(stmt.then_block)
+        if not self.cur_block.is_terminated():
+            self.cur_block.emit_jump(merge_block)
+
+        self._switch_to_block(merge_block)
+
+    def _build_folded_condition(self, stmt: Condition, is_taken: bool):
+        """Builds only the branch selected by a compile-time constant condition."""
+        taken = stmt.then_block if is_taken else stmt.else_block
+        if taken is None:
+            return
+
+        taken_block = self._new_block(
+            unwrap(taken.symbol_table), "then" if is_taken else "else"
+        )
+        merge_block = self._new_block(self.cur_block.symbol_table, "merge")
 
-        if len(self.cur_block.instructions) == 0 or not isinstance(
-            self.cur_block.instructions[-1], (InstUncondJump, InstCmp, InstReturn)
-        ):
-            self.cur_block.add_child(merge_block)
-            self.cur_block.append(InstUncondJump(merge_block))
+        self.cur_block.emit_jump(taken_block)
+        self._switch_to_block(taken_block)
+        self._build_block(taken)
+        if not self.cur_block.is_terminated():
+            self.cur_block.emit_jump(merge_block)
 
         self._switch_to_block(merge_block)
 
     def _build_for_loop(self, stmt: ForLoop):
-        assert self.cur_block is not None, "Current block must be set"
-
         body_st = unwrap(stmt.body.symbol_table)
+        if _fold_constant_expression(stmt.condition) == 0:
+            # the body is never entered: only the init assignments are executed
+            init_block = self._new_block(body_st, "condition check")
+            exit_block = self._new_block(self.cur_block.symbol_table, "loop exit")
+
+            self.cur_block.emit_jump(init_block)
+            self._switch_to_block(init_block)
+            for assignment in stmt.init:
+                self._build_assignment(assignment)
+            self.cur_block.emit_jump(exit_block)
+
+            self._switch_to_block(exit_block)
+            return
+
         initial_cond_block = self._new_block(body_st, "condition check")
         preheader_block = self._new_block(body_st, "loop preheader")
         body_block = self._new_block(body_st, "loop body")
@@ -701,57 +975,40 @@ class CFGBuilder:
         tail_block = self._new_block(body_st, "loop tail")
         exit_block = self._new_block(self.cur_block.symbol_table, "loop exit")
 
-        self.cur_block.append(InstUncondJump(initial_cond_block))
-        self.cur_block.add_child(initial_cond_block)
+        self.cur_block.emit_jump(initial_cond_block)
         self._switch_to_block(initial_cond_block)
 
         for assignment in stmt.init:
             self._build_assignment(assignment)
         cond_var = self._build_subexpression(stmt.condition, self._get_tmp_var())
-        self.cur_block.append(
-            InstCmp(cond_var, SSAConstant(0), exit_block, preheader_block)
-        )
-        self.cur_block.add_child(preheader_block)
-        self.cur_block.add_child(exit_block)
+        self.cur_block.emit_cmp(cond_var, self._const(0), exit_block, preheader_block)
 
         self._switch_to_block(preheader_block)
-        self.cur_block.append(InstUncondJump(body_block))
-        self.cur_block.add_child(body_block)
+        self.cur_block.emit_jump(body_block)
 
-        self.break_targets.append(tail_block)
-        self.continue_targets.append(latch_block)
+        prev_loop = self._loop
+        self._loop = LoopScope(tail_block, latch_block, prev_loop)
         self._switch_to_block(body_block)
         self._build_block(stmt.body)
 
-        if len(self.cur_block.instructions) == 0 or not isinstance(
-            self.cur_block.instructions[-1], (InstUncondJump, InstCmp, InstReturn)
-        ):
-            self.cur_block.add_child(latch_block)
-            self.cur_block.append(InstUncondJump(latch_block))
+        if not self.cur_block.is_terminated():
+            self.cur_block.emit_jump(latch_block)
 
         self._switch_to_block(latch_block)
         for reassignment in stmt.update:
             self._build_reassignment(reassignment)
         cond_var2 = self._build_subexpression(stmt.condition, self._get_tmp_var())
-        self.cur_block.append(
-            InstCmp(cond_var2, SSAConstant(0), tail_block, body_block)
-        )
-        self.cur_block.add_child(body_block)
-        self.cur_block.add_child(tail_block)
+        self.cur_block.emit_cmp(cond_var2, self._const(0), tail_block, body_block)
 
-        self.break_targets.pop()
-        self.continue_targets.pop()
+        self._loop = prev_loop
 
         self._switch_to_block(tail_block)
-        self.cur_block.append(InstUncondJump(exit_block))
-        self.cur_block.add_child(exit_block)
+        self.cur_block.emit_jump(exit_block)
 
         self._switch_to_block(exit_block)
         self.cfg.loops_info.append(LoopInfo(preheader_block, body_block, tail_block))
 
     def _build_unconditional_loop(self, stmt: UnconditionalLoop):
-        assert self.cur_block is not None, "Current block must be set"
-
         body_st = unwrap(stmt.body.symbol_table)
         preheader_block = self._new_block(body_st, "uncond loop preheader")
         body_block = self._new_block(body_st, "uncond loop body")
@@ -759,41 +1016,30 @@ class CFGBuilder:
         tail_block = self._new_block(body_st, "uncond loop tail")
         exit_block = self._new_block(self.cur_block.symbol_table, "uncond loop exit")
 
-        self.cur_block.append(InstUncondJump(preheader_block))
-        self.cur_block.add_child(preheader_block)
+        self.cur_block.emit_jump(preheader_block)
         self._switch_to_block(preheader_block)
 
-        self.cur_block.append(InstUncondJump(body_block))
-        self.cur_block.add_child(body_block)
+        self.cur_block.emit_jump(body_block)
         self._switch_to_block(body_block)
 
-        self.break_targets.append(tail_block)
-        self.continue_targets.append(latch_block)
+        prev_loop = self._loop
+        self._loop = LoopScope(tail_block, latch_block, prev_loop)
         self._build_block(stmt.body)
-        self.break_targets.pop()
-        self.continue_targets.pop()
+        self._loop = prev_loop
 
-        if len(self.cur_block.instructions) == 0 or not isinstance(
-            self.cur_block.instructions[-1], (InstUncondJump, InstCmp, InstReturn)
-        ):
-            self.cur_block.add_child(latch_block)
-            self.cur_block.append(InstUncondJump(latch_block))
+        if not self.cur_block.is_terminated():
+            self.cur_block.emit_jump(latch_block)
 
         self._switch_to_block(latch_block)
-        self.cur_block.append(InstUncondJump(body_block))
-        self.cur_block.add_child(body_block)
+        self.cur_block.emit_jump(body_block)
 
         self._switch_to_block(tail_block)
-        self.cur_block.append(InstUncondJump(exit_block))
-        self.cur_block.add_child(exit_block)
+        self.cur_block.emit_jump(exit_block)
 
         self._switch_to_block(exit_block)
         self.cfg.loops_info.append(LoopInfo(preheader_block, body_block, tail_block))
 
     def _build_return(self, stmt: Return):
-        assert self.cur_block is not None, "Current block must be set"
-        assert self.cfg is not None, "Current CFG must be set"
-
         if stmt.value is not None:
             ret_ssa = self._build_subexpression(stmt.value, self._get_tmp_var())
             self.cur_block.append(InstReturn(ret_ssa))
@@ -806,18 +1052,9 @@ class CFGBuilder:
         )
 
     def _build_break(self, _: Break):
-        assert self.cur_block is not None, "Current block must be set"
-
-        assert self.break_targets
-        if self.break_targets:
-            target = self.break_targets[-1]
-            self.cur_block.add_child(target)
-            self.cur_block.append(InstUncondJump(target))
+        if self._loop is not None:
+            self.cur_block.emit_jump(self._loop.brk)
 
     def _build_continue(self, _: Continue):
-        assert self.cur_block is not None, "Current block must be set"
-
-        if self.continue_targets:
-            target = self.continue_targets[-1]
-            self.cur_block.add_child(target)
-            self.cur_block.append(InstUncondJump(target))
+        if self._loop is not None:
+            self.cur_block.emit_jump(self._loop.cont)
@@ -30,10 +30,9 @@ def prune_unreachable(cfg: CFG, reachable_blocks: set[BasicBlock]):
     while len(q) > 0:
         bb = q.pop()
         visited.add(bb)
-        for i in range(len(bb.preds) - 1, -1, -1):
-            p = bb.preds[i]
+        for p in list(bb.preds.values()):
             if p not in reachable_blocks:
-                bb.preds.pop(i)
+                del bb.preds[p.label]
                 continue
 
             if p not in visited:
@@ -69,9 +68,10 @@ def _compute_dominators(
                 continue
 
             if block.preds:
-                new_dom = dominators[block.preds[0]].copy()
+                preds = iter(block.preds.values())
+                new_dom = dominators[next(preds)].copy()
 
-                for pred in (x for x in block.preds[1:] if x in reachable_blocks):
+                for pred in (x for x in preds if x in reachable_blocks):
                     new_dom = new_dom.intersection(dominators[pred])
 
                 new_dom.add(block)
@@ -126,7 +126,7 @@ def compute_dominance_frontier_graph(
 ) -> dict[BasicBlock, set[BasicBlock]]:
     DF: dict[BasicBlock, set[BasicBlock]] = defaultdict(set)
     for node in cfg:
-        for pred in node.preds:
+        for pred in node.preds.values():
             while pred != idom_tree.idom[node]:
                 DF[pred].add(node)
                 pred = unwrap(idom_tree.idom[pred])
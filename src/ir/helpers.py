@@ -1,28 +1,25 @@
-from hashlib import sha256
+import colorsys
 from typing import Any, Optional
+from zlib import crc32
 
 
-bb_colors = {}
+def _hsv_to_hex(h: float, s: float, v: float) -> str:
+    r, g, b = (round(c * 255) for c in colorsys.hsv_to_rgb(h, s, v))
+    return f"#{r:02x}{g:02x}{b:02x}"
 
 
-def color_label(l: str) -> str:
-    if bb_colors.get(l) is None:
-        h = sha256(l.encode()).hexdigest()
+_PALETTE = tuple(_hsv_to_hex(h / 256, 0.6, 0.9) for h in range(256))
 
-        r = h[-2:]
-        g = h[0:2]
-        b = h[-4:-2]
+bb_colors = {}
 
-        if len(r) == 1:
-            r = "0" + r
-        if len(b) == 1:
-            b = "0" + b
-        if len(g) == 1:
-            g = "0" + g
 
-        bb_colors[l] = f"#{r}{g}{b}"
+def color_label(l: str) -> str:
+    color = bb_colors.get(l)
+    if color is None:
+        # crc32 instead of hash(): colors must not change between runs
+        color = bb_colors[l] = _PALETTE[crc32(l.encode()) & 0xFF]
 
-    return f'<B><font color="{bb_colors[l]}">{l}</font></B>'
+    return f'<B><font color="{color}">{l}</font></B>'
 
 
 def unwrap[T: Any](v: Optional[T]) -> T:
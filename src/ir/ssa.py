@@ -50,7 +50,7 @@ class SSABuilder:
             for bb in self.cfg:
                 uses, defs = block_ud[bb]
                 new_out: set[str] = set()
-                for succ in bb.succ:
+                for succ in bb.succ.values():
                     new_out |= self.live_in[succ]
                 new_in = uses | (new_out - defs)
                 if new_out != self.live_out[bb] or new_in != self.live_in[bb]:
@@ -232,7 +232,7 @@ class SSABuilder:
             if var is not None:
                 block_new_assign_count[var] += 1
 
-        for succ in bb.succ:
+        for succ in bb.succ.values():
             for phi_var, phi_inst in succ.phi_nodes.items():
                 if self.versions.get(phi_var) is None:
                     continue
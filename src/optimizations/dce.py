@@ -19,6 +19,7 @@ from src.ir.cfg import (
     OpBinary,
     OpUnary,
     OpCall,
+    BinOp,
     SSAConstant,
     SSAValue,
     SSAVariable,
@@ -121,7 +122,7 @@ class DCE(OptimizationPass):
             var_work.append(key)
             self.live_insts.add(inst)
 
-        q = [pred for pred in bb.preds if pred != bb]
+        q = [pred for pred in bb.preds.values() if pred != bb]
         seen: set[BasicBlock] = set()  # do NOT include bb
         while len(q) > 0:
             cur = q.pop()
@@ -154,7 +155,7 @@ class DCE(OptimizationPass):
                         var_work.append(key)
 
             if not dead_end:
-                q.extend((pred for pred in cur.preds if pred not in seen))
+                q.extend((pred for pred in cur.preds.values() if pred not in seen))
 
     def mark_value_live(
         self,
@@ -188,7 +189,9 @@ class DCE(OptimizationPass):
                             self._mark_pointer_chain(cfg.exit, lhs, -1, var_work)
                     case InstAssign(_, rhs):
                         match rhs:
-                            case OpBinary("/" | "%", _, SSAVariable() | SSAConstant(0)):
+                            case OpBinary(
+                                BinOp.DIV | BinOp.MOD, _, SSAVariable() | SSAConstant(0)
+                            ):
                                 # division-by-zero or modulo zero, which is side-effectful -> can't remove
                                 self.live_insts.add(inst)
                                 self.mark_value_live(bb, i, rhs.left, var_work)
@@ -80,7 +80,13 @@ class LICM(OptimizationPass):
             seen_blocks.add(bb)
             yield bb
 
-            q.extend((s for s in bb.succ if s in loop_blocks and s not in seen_blocks))
+            q.extend(
+                (
+                    s
+                    for s in bb.succ.values()
+                    if s in loop_blocks and s not in seen_blocks
+                )
+            )
 
     def _collect_loop_blocks(self, cfg: CFG):
         for loop_info in cfg.loops_info:
@@ -91,7 +97,7 @@ class LICM(OptimizationPass):
                 if bb in loop_blocks:
                     continue
                 loop_blocks.add(bb)
-                q.extend((p for p in bb.preds if p not in loop_blocks))
+                q.extend((p for p in bb.preds.values() if p not in loop_blocks))
 
             loop_blocks.remove(loop_info.preheader)
             loop_info.blocks = loop_blocks
@@ -20,9 +20,13 @@ from src.ir.cfg import (
     OpBinary,
     OpUnary,
     OpCall,
+    BinOp,
+    UnOp,
     SSAValue,
     SSAVariable,
     SSAConstant,
+    eval_binary_op,
+    eval_unary_op,
 )
 from src.ir.helpers import unwrap
 
@@ -241,7 +245,7 @@ class SCCP(OptimizationPass):
         # join over executable predecessors only
         vals: list[LatticeValue] = []
         succ_block = self.inst_block[phi]
-        for pred in succ_block.preds:
+        for pred in succ_block.preds.values():
             if (pred, succ_block) not in self.feasible_edges:
                 continue
             # Must have incoming mapping for pred label
@@ -290,11 +294,8 @@ class SCCP(OptimizationPass):
     def _evaluate_store(self, inst: InstStore):
         return LatticeValue.nac()
 
-    def _truthy(self, v: int) -> int:
-        return 1 if v != 0 else 0
-
-    def _eval_binary(self, op: str, a: LatticeValue, b: LatticeValue) -> LatticeValue:
-        if op == "*":
+    def _eval_binary(self, op: BinOp, a: LatticeValue, b: LatticeValue) -> LatticeValue:
+        if op == BinOp.MUL:
             if a.is_const() and a.value == 0 or b.is_const() and b.value == 0:
                 return LatticeValue.const(0)
 
@@ -304,55 +305,21 @@ class SCCP(OptimizationPass):
         if not a.is_const() or not b.is_const():
             return LatticeValue.undef()
 
-        x, y = unwrap(a.value), unwrap(b.value)
-        if op == "+":
-            return LatticeValue.const(x + y)
-        if op == "-":
-            return LatticeValue.const(x - y)
-        if op == "*":
-            return LatticeValue.const(x * y)
-        if op == "/":
-            if y == 0:
-                return LatticeValue.nac()
-            return LatticeValue.const(x // y)
-        if op == "%":
-            if y == 0:
-                return LatticeValue.nac()
-            return LatticeValue.const(x % y)
-        if op == "==":
-            return LatticeValue.const(1 if x == y else 0)
-        if op == "!=":
-            return LatticeValue.const(1 if x != y else 0)
-        if op == "<":
-            return LatticeValue.const(1 if x < y else 0)
-        if op == "<=":
-            return LatticeValue.const(1 if x <= y else 0)
-        if op == ">":
-            return LatticeValue.const(1 if x > y else 0)
-        if op == ">=":
-            return LatticeValue.const(1 if x >= y else 0)
-        if op == "&&":
-            return LatticeValue.const(self._truthy(x) & self._truthy(y))
-        if op == "||":
-            return LatticeValue.const(1 if (self._truthy(x) | self._truthy(y)) else 0)
-
-        raise RuntimeError(f"Unknown operator: {op}")
-
-    def _eval_unary(self, op: str, v: LatticeValue) -> LatticeValue:
+        res = eval_binary_op(op, unwrap(a.value), unwrap(b.value))
+        if res is None:
+            return LatticeValue.nac()
+        return LatticeValue.const(res)
+
+    def _eval_unary(self, op: UnOp, v: LatticeValue) -> LatticeValue:
         if v.is_nac():
             return LatticeValue.nac()
         if not v.is_const():
             return LatticeValue.undef()
 
-        x = unwrap(v.value)
-        if op == "+":
-            return LatticeValue.const(x)
-        if op == "-":
-            return LatticeValue.const(-x)
-        if op == "!":
-            return LatticeValue.const(0 if x != 0 else 1)
-
-        return LatticeValue.nac()
+        res = eval_unary_op(op, unwrap(v.value))
+        if res is None:
+            return LatticeValue.nac()
+        return LatticeValue.const(res)
 
     def _evaluate_branch(self, br: InstCmp, bb: BasicBlock):
         lv = self._get_lattice_of_value(br.left)
@@ -373,30 +340,18 @@ class SCCP(OptimizationPass):
         assert self.cfg is not None
 
         for bb in list(self.cfg):
-            if bb in self.executable_blocks:
-                continue
-
-            for pred in bb.preds:
-                pred.succ.remove(bb)
-
-            for succ in bb.succ:
-                succ.preds.remove(bb)
-                for phi in succ.phi_nodes.values():
-                    phi.rhs.pop(bb.label, None)
-
-            bb.succ = []
-            bb.preds = []
+            if bb not in self.executable_blocks:
+                self.cfg.remove_block(bb)
 
     def _fold_constants(self):
         assert self.cfg is not None
 
         for bb in self.cfg:
-            pred_labels = set(pred.label for pred in bb.preds)
             for phi_node in bb.phi_nodes.values():
                 new_rhs = {
                     pred: self._replace_in_rhs(val)
                     for pred, val in phi_node.rhs.items()
-                    if pred in pred_labels
+                    if pred in bb.preds
                 }
                 phi_node.rhs = new_rhs
 
@@ -437,17 +392,17 @@ class SCCP(OptimizationPass):
 
                         if left_lattice.is_const() and right_lattice.is_const():
                             if left_lattice.value == right_lattice.value:
-                                bb.instructions[i] = InstUncondJump(inst.then_block)
-                                for s in bb.succ:
+                                bb.instructions[i] = inst.then_block.jump_inst()
+                                for s in bb.succ.values():
                                     if s.label != inst.then_block.label:
-                                        s.preds.remove(bb)
-                                bb.succ = [inst.then_block]
+                                        del s.preds[bb.label]
+                                bb.succ = {inst.then_block.label: inst.then_block}
                             else:
-                                bb.instructions[i] = InstUncondJump(inst.else_block)
-                                for s in bb.succ:
+                                bb.instructions[i] = inst.else_block.jump_inst()
+                                for s in bb.succ.values():
                                     if s.label != inst.else_block.label:
-                                        s.preds.remove(bb)
-                                bb.succ = [inst.else_block]
+                                        del s.preds[bb.label]
+                                bb.succ = {inst.else_block.label: inst.else_block}
                     case InstReturn(value):
                         if value is not None:
                             inst.value = self._replace_value(value)
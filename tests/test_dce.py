@@ -517,7 +517,8 @@ class TestDCE(base.TestBase):
         src = """
         func main() -> int {
             let arr [10]int = {};
-            if (1) {
+            let z int = 1;
+            if (z) {
                 // not dead!
                 arr[0] = 1;  
             } 
@@ -529,7 +530,8 @@ class TestDCE(base.TestBase):
             ; pred: []
             BB0: ; [entry]
                 (<~)arr_v1 = array_init([10])
-                cmp(1, 0)
+                z_v1 = 1
+                cmp(z_v1, 0)
                 if CF == 0 then jmp BB2 else jmp BB3
             ; succ: [BB2, BB3]
 
@@ -1065,7 +1067,8 @@ class TestDCE(base.TestBase):
             a[0] = 1;
             foo(a);
             
-            if (1) {
+            let z int = 1;
+            if (z) {
                 a[2] = 3; // dead
             }
             return 0;
@@ -1083,7 +1086,8 @@ class TestDCE(base.TestBase):
                 (a_v1<~)%2_v1 = (<~)a_v1 + %1_v1
                 Store((a_v1<~)%2_v1, 1)
                 %4_v1 = foo((<~)a_v1)
-                cmp(1, 0)
+                z_v1 = 1
+                cmp(z_v1, 0)
                 if CF == 0 then jmp BB2 else jmp BB3
             ; succ: [BB2, BB3]
 
@@ -1099,7 +1103,7 @@ class TestDCE(base.TestBase):
             ; pred: [BB0]
             BB2: ; [then]
                 jmp BB3
-            ; succ: [BB3]        
+            ; succ: [BB3]
         """).strip()
 
         self.assert_ir(src, expected_ir)
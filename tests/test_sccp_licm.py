@@ -15,8 +15,9 @@ class TestSCCPandLICM(base.TestBase):
                 let x int = 0;
                 let a int = 1;
                 let b int = 2;
+                let z int = 0;
                 for (let i int = 0; 1; i = i + 1) {
-                    for (let j int = 0; 0; j = j + 1) {
+                    for (let j int = 0; z; j = j + 1) {
                         // the loop just adds some empty blocks 
                     }
 
@@ -50,6 +51,7 @@ class TestSCCPandLICM(base.TestBase):
                 x_v1 = 0
                 a_v1 = 1
                 b_v1 = 2
+                z_v1 = 0
                 jmp BB2
             ; succ: [BB2]
 
@@ -62,13 +64,12 @@ class TestSCCPandLICM(base.TestBase):
             ; pred: [BB2]
             BB3: ; [loop preheader]
                 j_v1 = 0
-                x_v3 = 2
+                x_v2 = 2
                 jmp BB4
             ; succ: [BB4]
 
             ; pred: [BB3, BB5]
             BB4: ; [loop body]
-                x_v2 = ϕ(BB3: 0, BB5: 0)
                 i_v2 = ϕ(BB3: 0, BB5: i_v3)
 
                 jmp BB8
@@ -88,8 +89,6 @@ class TestSCCPandLICM(base.TestBase):
 
             ; pred: [BB13]
             BB15: ; [merge]
-                x_v4 = ϕ(BB13: 0)
-
                 jmp BB5
             ; succ: [BB5]
 
@@ -114,14 +113,14 @@ class TestSCCPandLICM(base.TestBase):
 
             ; pred: [BB18, BB16]
             BB6: ; [loop tail]
-                x_v5 = ϕ(BB16: 2, BB18: 2)
+                x_v3 = ϕ(BB16: 2, BB18: 2)
 
                 jmp BB7
             ; succ: [BB7]
 
             ; pred: [BB6]
             BB7: ; [loop exit]
-                x_v6 = ϕ(BB6: 2)
+                x_v4 = ϕ(BB6: 2)
 
                 return(2)
             ; succ: [BB1]
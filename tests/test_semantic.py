@@ -1,72 +1,44 @@
+import functools
+import re
 import unittest
+from collections.abc import Sequence
 from src.parsing.lexer import Lexer
-from src.parsing.parser import Parser
+from src.parsing.parser import Parser, Program
 from src.parsing.semantic import SemanticAnalyzer, SemanticError
 
+# Snippets shared by several cases
+SRC_MAIN_EMPTY = "func main() -> void { }"
+SRC_FOO_FN = "func foo() -> int { return 1; }"
+SRC_ADD_FN = "func add(x int, y int) -> int { return x + y; }\n"
 
-class TestSemanticAnalyzer(unittest.TestCase):
-    """Unit tests for the SemanticAnalyzer class."""
-
-    def analyze_source(self, source: str) -> list[SemanticError]:
-        """Helper method to analyze source code."""
-        lexer = Lexer(source)
-        parser = Parser(lexer)
-        ast = parser.parse()
-        analyzer = SemanticAnalyzer(ast)
-        return analyzer.analyze()
-
-    def assert_no_errors(self, source: str):
-        """Assert that semantic analysis produces no errors."""
-        errors = self.analyze_source(source)
-        self.assertEqual(len(errors), 0, f"Expected no errors but got: {errors}")
-
-    def assert_has_error(self, source: str, expected_error_substring: str):
-        """Assert that semantic analysis produces an error containing the substring."""
-        errors = self.analyze_source(source)
-        self.assertGreater(len(errors), 0, f"Expected at least one error but got none")
-        error_messages = [str(e) for e in errors]
-        self.assertTrue(
-            any(expected_error_substring in msg for msg in error_messages),
-            f"Expected error containing '{expected_error_substring}' but got: {error_messages}",
-        )
-
-    # Valid programs
 
-    def test_valid_simple_program(self):
-        """Test valid simple program."""
-        source = "func main() -> void { }"
-        self.assert_no_errors(source)
+@functools.lru_cache(maxsize=256)
+def _parse(source: str) -> Program:
+    """Parses source code once per distinct snippet.
 
-    def test_valid_function_with_return(self):
-        """Test valid function with return statement."""
-        source = "func foo() -> int { return 1; }"
-        self.assert_no_errors(source)
+    Sharing the AST is safe: every analysis assigns fresh symbol tables
+    to all of its blocks.
+    """
+    return Parser(Lexer(source)).parse()
 
-    def test_valid_assignment(self):
-        """Test valid assignment."""
-        source = "func main() -> void { let a int = 1; }"
-        self.assert_no_errors(source)
 
-    def test_valid_reassignment(self):
-        """Test valid reassignment."""
-        source = "func main() -> void { let a int = 1; a = 2; }"
-        self.assert_no_errors(source)
+@functools.cache
+def _cached_analyze(source: str) -> tuple[str, ...]:
+    """Analyzes source code once per distinct snippet, returning the error messages."""
+    analyzer = SemanticAnalyzer(_parse(source))
+    return tuple(str(e) for e in analyzer.analyze())
 
-    def test_valid_function_call(self):
-        """Test valid function call."""
-        source = """func foo() -> int { return 1; }
-func main() -> void { foo(); }"""
-        self.assert_no_errors(source)
 
-    def test_valid_function_with_arguments(self):
-        """Test valid function with arguments."""
-        source = """func add(x int, y int) -> int { return x + y; }
-func main() -> void { let a int = add(1, 2); }"""
-        self.assert_no_errors(source)
-
-    def test_valid_complex_program(self):
-        """Test valid complex program."""
-        source = """func add(x int, y int) -> int {
+VALID_SOURCES: dict[str, str] = {
+    # Valid programs
+    "valid_simple_program": SRC_MAIN_EMPTY,
+    "valid_function_with_return": SRC_FOO_FN,
+    "valid_assignment": "func main() -> void { let a int = 1; }",
+    "valid_reassignment": "func main() -> void { let a int = 1; a = 2; }",
+    "valid_function_call": SRC_FOO_FN + "\nfunc main() -> void { foo(); }",
+    "valid_function_with_arguments": SRC_ADD_FN
+    + "func main() -> void { let a int = add(1, 2); }",
+    "valid_complex_program": """func add(x int, y int) -> int {
     return x + y;
 }
 
@@ -78,347 +50,304 @@ func main() -> void {
         let d int = c * 2;
     }
     return;
-}"""
-        self.assert_no_errors(source)
-
-    # Function existence errors
-
-    def test_undefined_function(self):
-        """Test error when function is not defined."""
-        source = "func main() -> void { foo(); }"
-        self.assert_has_error(source, "Function 'foo' is not declared")
-
-    def test_undefined_function_in_expression(self):
-        """Test error when function call in expression is undefined."""
-        source = "func main() -> void { let a int = bar(); }"
-        self.assert_has_error(source, "Function 'bar' is not declared")
-
+}""",
     # Function argument errors
-
-    def test_wrong_argument_count_too_many(self):
-        """Test error when too many arguments provided."""
-        source = """func foo(x int) -> int { return x; }
-func main() -> void { foo(1, 2); }"""
-        self.assert_has_error(source, "expects 1 arguments, but got 2")
-
-    def test_wrong_argument_count_too_few(self):
-        """Test error when too few arguments provided."""
-        source = """func foo(x int, y int) -> int { return x; }
-func main() -> void { foo(1); }"""
-        self.assert_has_error(source, "expects 2 arguments, but got 1")
-
-    def test_wrong_argument_count_zero_expected(self):
-        """Test error when function expects no arguments but gets some."""
-        source = """func foo() -> int { return 1; }
-func main() -> void { foo(1); }"""
-        self.assert_has_error(source, "expects 0 arguments, but got 1")
-
-    def test_wrong_argument_type(self):
-        """Test error when argument type doesn't match."""
-        # Note: In this language, all expressions are int, so this test
-        # might not directly apply, but we test the mechanism
-        source = """func foo(x int) -> int { return x; }
+    # Note: In this language, all expressions are int, so this test
+    # might not directly apply, but we test the mechanism
+    "wrong_argument_type": """func foo(x int) -> int { return x; }
 func main() -> void { 
     let y int = 1;
     foo(y);  // This should be OK since y is int
-}"""
-        self.assert_no_errors(source)
-
+}""",
     # Variable scope errors
-
-    def test_undefined_variable(self):
-        """Test error when variable is not defined."""
-        source = "func main() -> void { let a int = x; }"
-        self.assert_has_error(source, "Variable 'x' is not declared")
-
-    def test_undefined_variable_in_reassignment(self):
-        """Test error when reassigning undefined variable."""
-        source = "func main() -> void { x = 1; }"
-        self.assert_has_error(source, "Variable 'x' is not declared")
-
-    def test_undefined_variable_in_expression(self):
-        """Test error when using undefined variable in expression."""
-        source = "func main() -> void { let a int = x + 1; }"
-        self.assert_has_error(source, "Variable 'x' is not declared")
-
-    def test_variable_redeclaration_same_scope(self):
-        """Test error when variable is redeclared in same scope."""
-        source = "func main() -> void { let a int = 1; let a int = 2; }"
-        self.assert_has_error(source, "Variable 'a' already declared in this scope")
-
-    def test_variable_redeclaration_parameter(self):
-        """Test error when variable shadows parameter."""
-        source = "func foo(x int) -> void { let x int = 1; }"
-        self.assert_has_error(source, "Variable 'x' already declared in this scope")
-
-    def test_variable_access_from_inner_scope(self):
-        """Test that variables from outer scope are accessible."""
-        source = """func main() -> void {
+    "variable_access_from_inner_scope": """func main() -> void {
     let a int = 1;
     if (a < 10) {
         let b int = a;
     }
-}"""
-        self.assert_no_errors(source)
-
-    def test_variable_not_accessible_from_outer_scope(self):
-        """Test error when accessing variable from inner scope."""
-        source = """func main() -> void {
-    if (1 < 10) {
-        let a int = 1;
-    }
-    let b int = a;
-}"""
-        self.assert_has_error(source, "Variable 'a' is not declared")
-
-    def test_variable_scope_in_for_loop(self):
-        """Test variable scope in for loop."""
-        source = """func main() -> void {
+}""",
+    "variable_scope_in_for_loop": """func main() -> void {
     for (let i int = 0; i < 10; i = i + 1) {
         let j int = i;
     }
-}"""
-        self.assert_no_errors(source)
-
-    def test_variable_scope_in_unconditional_loop(self):
-        """Test variable scope in unconditional loop."""
-        source = """func main() -> void {
+}""",
+    "variable_scope_in_unconditional_loop": """func main() -> void {
     for {
         let a int = 1;
     }
-}"""
-        self.assert_no_errors(source)
-
+}""",
     # Return type errors
-
-    def test_return_type_mismatch_void_function(self):
-        """Test error when void function returns a value."""
-        source = "func foo() -> void { return 1; }"
-        self.assert_has_error(source, "returns void, but return statement has a value")
-
-    def test_return_type_mismatch_int_function_no_value(self):
-        """Test error when int function returns no value."""
-        source = "func foo() -> int { return; }"
-        self.assert_has_error(source, "expects return type int, but got void")
-
-    def test_return_type_mismatch_value_type(self):
-        """Test error when return value type doesn't match."""
-        # In this language, all expressions are int, so this is mainly
-        # checking that void functions don't return values
-        source = "func foo() -> int { return 1 + 2; }"
-        self.assert_no_errors(source)
-
-    def test_return_outside_function(self):
-        """Test that return outside function is caught (though parser prevents this)."""
-        # This would be caught by parser, but we test the semantic check
-        pass
-
+    # In this language, all expressions are int, so this is mainly
+    # checking that void functions don't return values
+    "return_type_mismatch_value_type": "func foo() -> int { return 1 + 2; }",
     # Type checking errors
-
-    def test_assignment_type_mismatch(self):
-        """Test error when assignment type doesn't match."""
-        # In this language, all expressions are int, so this test mainly
-        # ensures the type checking mechanism works
-        source = "func main() -> void { let a int = 1; }"
-        self.assert_no_errors(source)
-
-    def test_reassignment_type_mismatch(self):
-        """Test error when reassignment type doesn't match."""
-        # Similar to above - all expressions are int
-        source = "func main() -> void { let a int = 1; a = 2; }"
-        self.assert_no_errors(source)
-
+    # In this language, all expressions are int, so this test mainly
+    # ensures the type checking mechanism works
+    "assignment_type_mismatch": "func main() -> void { let a int = 1; }",
+    # Similar to above - all expressions are int
+    "reassignment_type_mismatch": "func main() -> void { let a int = 1; a = 2; }",
     # Expression type checking
-
-    def test_binary_operation_types(self):
-        """Test that binary operations work correctly."""
-        source = "func main() -> void { let a int = 1 + 2; let b int = 3 * 4; let c int = 5 - 6; }"
-        self.assert_no_errors(source)
-
-    def test_unary_operation_types(self):
-        """Test that unary operations work correctly."""
-        source = "func main() -> void { let a int = -1; let b int = !0; }"
-        self.assert_no_errors(source)
-
-    def test_comparison_operations(self):
-        """Test that comparison operations work correctly."""
-        source = "func main() -> void { let a int = 1 < 2; let b int = 3 > 4; let c int = 5 == 6; }"
-        self.assert_no_errors(source)
-
-    def test_logical_operations(self):
-        """Test that logical operations work correctly."""
-        source = "func main() -> void { let a int = 1 && 2; let b int = 3 || 4; }"
-        self.assert_no_errors(source)
-
-    # Function declaration errors
-
-    def test_duplicate_function_declaration(self):
-        """Test error when function is declared twice."""
-        source = """func foo() -> void { }
-func foo() -> void { }"""
-        self.assert_has_error(source, "Function 'foo' already declared")
-
+    "binary_operation_types": "func main() -> void { let a int = 1 + 2; let b int = 3 * 4; let c int = 5 - 6; }",
+    "unary_operation_types": "func main() -> void { let a int = -1; let b int = !0; }",
+    "comparison_operations": "func main() -> void { let a int = 1 < 2; let b int = 3 > 4; let c int = 5 == 6; }",
+    "logical_operations": "func main() -> void { let a int = 1 && 2; let b int = 3 || 4; }",
     # Condition and loop errors
-
-    def test_condition_expression_type(self):
-        """Test that condition expression must be int."""
-        # In this language, all expressions are int, so conditions are fine
-        source = "func main() -> void { if (1 < 2) { } }"
-        self.assert_no_errors(source)
-
-    def test_for_loop_condition_type(self):
-        """Test that for loop condition must be int."""
-        source = "func main() -> void { for (let i int = 0; i < 10; i = i + 1) { } }"
-        self.assert_no_errors(source)
-
+    # In this language, all expressions are int, so conditions are fine
+    "condition_expression_type": "func main() -> void { if (1 < 2) { } }",
+    "for_loop_condition_type": "func main() -> void { for (let i int = 0; i < 10; i = i + 1) { } }",
     # Complex scenarios
-
-    def test_nested_function_calls(self):
-        """Test nested function calls."""
-        source = """func add(x int, y int) -> int { return x + y; }
-func main() -> void {
+    "nested_function_calls": SRC_ADD_FN
+    + """func main() -> void {
     let a int = add(add(1, 2), add(3, 4));
-}"""
-        self.assert_no_errors(source)
-
-    def test_function_call_as_argument(self):
-        """Test function call as function argument."""
-        source = """func add(x int, y int) -> int { return x + y; }
-func main() -> void {
+}""",
+    "function_call_as_argument": SRC_ADD_FN
+    + """func main() -> void {
     let a int = add(add(1, 2), 3);
-}"""
-        self.assert_no_errors(source)
-
-    def test_multiple_errors(self):
-        """Test that multiple errors are detected."""
-        source = """func main() -> void {
-    let a int = x;  // x undefined
-    foo();  // foo undefined
-    let b int = a;  // OK - a is defined
-}"""
-        errors = self.analyze_source(source)
-        self.assertGreaterEqual(len(errors), 2, "Expected at least 2 errors")
-
-    def test_parameter_usage(self):
-        """Test that function parameters can be used."""
-        source = """func add(x int, y int) -> int {
+}""",
+    "parameter_usage": """func add(x int, y int) -> int {
     return x + y;
-}"""
-        self.assert_no_errors(source)
-
-    def test_parameter_in_expression(self):
-        """Test using parameters in expressions."""
-        source = """func compute(a int, b int) -> int {
+}""",
+    "parameter_in_expression": """func compute(a int, b int) -> int {
     let c int = a + b;
     return c * 2;
-}"""
-        self.assert_no_errors(source)
-
-    def test_if_else_blocks(self):
-        """Test if-else blocks."""
-        source = """func main() -> void {
+}""",
+    "if_else_blocks": """func main() -> void {
     if (1 < 2) {
         let a int = 1;
     } else {
         let a int = 2;
     }
-}"""
-        self.assert_no_errors(source)
-
-    def test_if_else_variable_scoping(self):
-        """Test variable scoping in if-else blocks."""
-        source = """func main() -> void {
+}""",
+    # This should be OK - each branch declares its own a
+    "if_else_variable_scoping": """func main() -> void {
     if (1 < 2) {
         let a int = 1;
     } else {
         let a int = 2;
     }
     // Each branch has its own scope, so a is not accessible here
-}"""
-        # This should be OK - each branch declares its own a
-        self.assert_no_errors(source)
-
-    def test_complex_expression_types(self):
-        """Test complex expression type checking."""
-        source = """func main() -> void {
+}""",
+    "complex_expression_types": """func main() -> void {
     let a int = (1 + 2) * (3 - 4);
     let b int = 1 < 2 && 3 > 4;
     let c int = 1 || 2 && 3;
-}"""
-        self.assert_no_errors(source)
-
-    def test_for_loop_variable_scope(self):
-        """Test variable scope in for loop init."""
-        source = """func main() -> void {
+}""",
+    "for_loop_variable_scope": """func main() -> void {
     for (let i int = 0; i < 10; i = i + 1) {
         let j int = i;  // i should be accessible
     }
-}"""
-        self.assert_no_errors(source)
-
-    def test_unconditional_loop_body(self):
-        """Test unconditional loop body."""
-        source = """func main() -> void {
+}""",
+    "unconditional_loop_body": """func main() -> void {
     for {
         let a int = 1;
         let b int = 2;
     }
-}"""
-        self.assert_no_errors(source)
-
-    def test_return_in_different_contexts(self):
-        """Test return statements in different contexts."""
-        source = """func foo() -> int {
+}""",
+    "return_in_different_contexts": """func foo() -> int {
     if (1 < 2) {
         return 1;
     } else {
         return 2;
     }
-}"""
-        self.assert_no_errors(source)
-
-    def test_function_call_with_variables(self):
-        """Test function call with variable arguments."""
-        source = """func add(x int, y int) -> int { return x + y; }
-func main() -> void {
+}""",
+    "function_call_with_variables": SRC_ADD_FN
+    + """func main() -> void {
     let a int = 1;
     let b int = 2;
     let c int = add(a, b);
-}"""
-        self.assert_no_errors(source)
-
-    def test_function_call_with_expressions(self):
-        """Test function call with expression arguments."""
-        source = """func add(x int, y int) -> int { return x + y; }
-func main() -> void {
+}""",
+    "function_call_with_expressions": SRC_ADD_FN
+    + """func main() -> void {
     let a int = add(1 + 2, 3 * 4);
-}"""
-        self.assert_no_errors(source)
-
-    def test_multiple_functions_valid(self):
-        """Test multiple valid functions."""
-        source = """func foo() -> int { return 1; }
+}""",
+    "multiple_functions_valid": SRC_FOO_FN
+    + """
 func bar() -> void { }
-func baz(x int) -> int { return x; }"""
-        self.assert_no_errors(source)
-
-    def test_calling_function_from_another_function(self):
-        """Test calling function from another function."""
-        source = """func helper() -> int { return 1; }
+func baz(x int) -> int { return x; }""",
+    "calling_function_from_another_function": """func helper() -> int { return 1; }
 func main() -> void {
     let a int = helper();
-}"""
-        self.assert_no_errors(source)
+}""",
+}
 
-    def test_loop_variable_scope(self):
-        """Test variable scope in block."""
-        source = """
+# case name -> (source, expected error substring)
+ERROR_CASES: dict[str, tuple[str, str]] = {
+    # Function existence errors
+    "undefined_function": (
+        "func main() -> void { foo(); }",
+        "Function 'foo' is not declared",
+    ),
+    "undefined_function_in_expression": (
+        "func main() -> void { let a int = bar(); }",
+        "Function 'bar' is not declared",
+    ),
+    # Function argument errors
+    "wrong_argument_count_too_many": (
+        """func foo(x int) -> int { return x; }
+func main() -> void { foo(1, 2); }""",
+        "expects 1 arguments, but got 2",
+    ),
+    "wrong_argument_count_too_few": (
+        """func foo(x int, y int) -> int { return x; }
+func main() -> void { foo(1); }""",
+        "expects 2 arguments, but got 1",
+    ),
+    "wrong_argument_count_zero_expected": (
+        SRC_FOO_FN + "\nfunc main() -> void { foo(1); }",
+        "expects 0 arguments, but got 1",
+    ),
+    # Variable scope errors
+    "undefined_variable": (
+        "func main() -> void { let a int = x; }",
+        "Variable 'x' is not declared",
+    ),
+    "undefined_variable_in_reassignment": (
+        "func main() -> void { x = 1; }",
+        "Variable 'x' is not declared",
+    ),
+    "undefined_variable_in_expression": (
+        "func main() -> void { let a int = x + 1; }",
+        "Variable 'x' is not declared",
+    ),
+    "variable_redeclaration_same_scope": (
+        "func main() -> void { let a int = 1; let a int = 2; }",
+        "Variable 'a' already declared in this scope",
+    ),
+    "variable_redeclaration_parameter": (
+        "func foo(x int) -> void { let x int = 1; }",
+        "Variable 'x' already declared in this scope",
+    ),
+    "variable_not_accessible_from_outer_scope": (
+        """func main() -> void {
+    if (1 < 10) {
+        let a int = 1;
+    }
+    let b int = a;
+}""",
+        "Variable 'a' is not declared",
+    ),
+    # Return type errors
+    "return_type_mismatch_void_function": (
+        "func foo() -> void { return 1; }",
+        "returns void, but return statement has a value",
+    ),
+    "return_type_mismatch_int_function_no_value": (
+        "func foo() -> int { return; }",
+        "expects return type int, but got void",
+    ),
+    # Function declaration errors
+    "duplicate_function_declaration": (
+        """func foo() -> void { }
+func foo() -> void { }""",
+        "Function 'foo' already declared",
+    ),
+    # Complex scenarios
+    "loop_variable_scope": (
+        """
         func main() -> int {
             for (let i int = 0; i < 10; i = i + 1) {
             }
             return i;
-        }"""
-        self.assert_has_error(source, "Variable 'i' is not declared")
+        }""",
+        "Variable 'i' is not declared",
+    ),
+}
+
+
+class TestSemanticAnalyzer(unittest.TestCase):
+    """Unit tests for the SemanticAnalyzer class."""
+
+    def analyze_source(self, source: str) -> tuple[str, ...]:
+        """Helper method to analyze source code."""
+        return _cached_analyze(source)
+
+    def assert_no_errors(self, source: str):
+        """Assert that semantic analysis produces no errors."""
+        errors = self.analyze_source(source)
+        if errors:
+            self.fail(f"Expected no errors but got: {errors}")
+
+    def assert_has_error(self, source: str, expected: str | Sequence[str]):
+        """Assert that semantic analysis produces errors containing every substring."""
+        substrings = (expected,) if isinstance(expected, str) else tuple(expected)
+        error_messages = self.analyze_source(source)
+        if not error_messages:
+            self.fail("Expected at least one error but got none")
+
+        haystack = "\n".join(error_messages)
+        missing = [sub for sub in substrings if sub not in haystack]
+        if missing:
+            self.fail(f"Expected errors containing {missing} but got: {error_messages}")
+
+    def test_valid_sources(self):
+        """Test that valid programs produce no errors."""
+        for name, source in VALID_SOURCES.items():
+            with self.subTest(name):
+                self.assert_no_errors(source)
+
+    def test_valid_sources_bulk(self):
+        """Test that all valid programs analyze cleanly as a single program."""
+        programs = []
+        defined = 0
+        for i, source in enumerate(VALID_SOURCES.values()):
+            # functions of different snippets share names, so give them a suffix
+            for name in re.findall(r"\bfunc\s+(\w+)", source):
+                source = re.sub(rf"\b{name}\s*\(", f"{name}_{i}(", source)
+                defined += 1
+            programs.append(source)
+        bulk_source = "\n".join(programs)
+
+        # the renaming must keep every function, each under a distinct name
+        names = {func.name for func in _parse(bulk_source).functions}
+        self.assertEqual(len(names), defined, "Renaming made function names collide")
+        self.assert_no_errors(bulk_source)
+
+    def test_error_cases(self):
+        """Test that invalid programs produce the expected error."""
+        for name, (source, expected_error) in ERROR_CASES.items():
+            with self.subTest(name):
+                self.assert_has_error(source, expected_error)
+
+    def test_multiple_errors(self):
+        """Test that multiple errors are detected."""
+        source = """func main() -> void {
+    let a int = x;  // x undefined
+    foo();  // foo undefined
+    let b int = a;  // OK - a is defined
+}"""
+        errors = self.analyze_source(source)
+        self.assertGreaterEqual(len(errors), 2, "Expected at least 2 errors")
+        self.assert_has_error(
+            source,
+            ["Variable 'x' is not declared", "Function 'foo' is not declared"],
+        )
+
+    def test_all_undefined_errors_in_one_pass(self):
+        """Test that undefined names are all reported by a single analysis."""
+        source = """func main() -> void {
+    let a int = x;  // x undefined
+    y = 1;  // y undefined
+    let b int = z + 1;  // z undefined
+    foo();  // foo undefined
+    let c int = bar();  // bar undefined
+    let a int = 2;  // a redeclared
+    if (1 < 10) {
+        let d int = 1;
+    }
+    let e int = d;  // d is out of scope
+}"""
+        self.assert_has_error(
+            source,
+            [
+                "Variable 'x' is not declared",
+                "Variable 'y' is not declared",
+                "Variable 'z' is not declared",
+                "Function 'foo' is not declared",
+                "Function 'bar' is not declared",
+                "Variable 'a' already declared in this scope",
+                "Variable 'd' is not declared",
+            ],
+        )
 
 
 if __name__ == "__main__":
@@ -322,3 +322,114 @@ class TestSSA(base.TestBase):
         """).strip()
 
         self.assert_ir(src, expected_ir)
+
+    def test_constant_condition_folding(self):
+        src = self.make_main("""
+            let x int = 0;
+            if (2 * 3 > 5) {
+                x = 1;
+            } else {
+                x = 2;
+            }
+            if (!1) {
+                x = 3;
+            }
+            return x;
+        """)
+
+        expected_ir = textwrap.dedent("""
+            ; pred: []
+            BB0: ; [entry]
+                x_v1 = 0
+                jmp BB2
+            ; succ: [BB2]
+
+            ; pred: [BB0]
+            BB2: ; [then]
+                x_v2 = 1
+                jmp BB3
+            ; succ: [BB3]
+
+            ; pred: [BB2]
+            BB3: ; [merge]
+                return(x_v2)
+            ; succ: [BB1]
+
+            ; pred: [BB3]
+            BB1: ; [exit]
+            ; succ: []
+        """).strip()
+
+        self.assert_ir(src, expected_ir)
+
+    def test_zero_condition_for_loop_folding(self):
+        src = self.make_main("""
+            let x int = 0;
+            for (let i int = 1; 0; i = i + 1) {
+                x = x + i;
+            }
+            return x;
+        """)
+
+        expected_ir = textwrap.dedent("""
+            ; pred: []
+            BB0: ; [entry]
+                x_v1 = 0
+                jmp BB2
+            ; succ: [BB2]
+
+            ; pred: [BB0]
+            BB2: ; [condition check]
+                i_v1 = 1
+                jmp BB3
+            ; succ: [BB3]
+
+            ; pred: [BB2]
+            BB3: ; [loop exit]
+                return(x_v1)
+            ; succ: [BB1]
+
+            ; pred: [BB3]
+            BB1: ; [exit]
+            ; succ: []
+        """).strip()
+
+        self.assert_ir(src, expected_ir)
+
+    def test_code_after_return_is_dropped(self):
+        src = self.make_main("""
+            let x int = 0;
+            if (x == 0) {
+                return 1;
+            } else {
+                return 2;
+            }
+            x = 3;
+            return x;
+        """)
+
+        expected_ir = textwrap.dedent("""
+            ; pred: []
+            BB0: ; [entry]
+                x_v1 = 0
+                %0_v1 = x_v1 == 0
+                cmp(%0_v1, 0)
+                if CF == 0 then jmp BB2 else jmp BB4
+            ; succ: [BB2, BB4]
+
+            ; pred: [BB0]
+            BB4: ; [else]
+                return(2)
+            ; succ: [BB1]
+
+            ; pred: [BB4, BB2]
+            BB1: ; [exit]
+            ; succ: []
+
+            ; pred: [BB0]
+            BB2: ; [then]
+                return(1)
+            ; succ: [BB1]
+        """).strip()
+
+        self.assert_ir(src, expected_ir)